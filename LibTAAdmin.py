@@ -3,6 +3,19 @@
 """This library provides functionalities for Token Access server-side actions.
 It impements administrative functions for SMTP and API servers,
 after loading configuration.
+
+It is also a non-interactive command line tool (heavy libraries, as the
+database drivers and the x509 toolkit, are loaded by the subcommands using
+them), e.g.:
+    python LibTAAdmin.py users add alice@example.com --file users.ldif
+    python LibTAAdmin.py --yes users del --file leavers.csv
+    python LibTAAdmin.py --yes tokens purge alice@example.com
+    python LibTAAdmin.py certs WEB_API --days 730
+    python LibTAAdmin.py stats --top 20
+    python LibTAAdmin.py maintain --max-duration 300
+    python LibTAAdmin.py traces --top 5
+The destructive subcommands ask for a confirmation on a terminal, and are
+refused without --yes otherwise.
 """
 __author__='Charles Dubos'
 __license__='GNUv3'
@@ -16,27 +29,23 @@ __status__='Development'
 
 # Built-in
 
-from os import environ, system
+from os import environ
 from os.path import dirname, abspath, exists
 from inspect import signature
 from datetime import datetime, timedelta
-import logging.config, ipaddress
-
-
-
-# Other libs
-
-from cryptography.hazmat.primitives.asymmetric import rsa
-from cryptography import x509
-from cryptography.x509.oid import NameOID
-from cryptography.hazmat.primitives import hashes, serialization
+from getpass import getpass
+from itertools import chain, islice
+import logging.config, ipaddress, argparse, base64, csv, json, sys
 
 
 
 # Owned libs
 
 from lib.LibTAServer import *
-from lib.LibTACrypto import HashText
+from lib.LibTARules import Rule
+from lib.LibTAContacts import parseAddressBook
+from lib.LibTAMaintenance import Maintenance
+from lib.LibTATracing import slowestTraces, formatTrace
 
 
 
@@ -55,12 +64,19 @@ logging.config.dictConfig({
             'format':'%(levelname)s:  %(asctime)s  [%(process)d][%(filename)s][%(funcName)s]  %(message)s',
         },
     },
+    'filters':{
+        'sampling':{
+            '()':'lib.LibTALogging.SamplingFilter',
+            'rate':context.GLOBAL['log_sampling'],
+        },
+    },
     'handlers':{
         "file_handler":{
-            'class':'logging.FileHandler',
+            'class':'lib.LibTALogging.QueueFileHandler',
             'filename':context.GLOBAL['logging'],
             'encoding':'utf-8',
             'formatter':'default_formatter',
+            'filters':['sampling'],
         },
     },
     'loggers':{
@@ -74,9 +90,6 @@ logging.config.dictConfig({
 logger = logging.getLogger('tknAcsServers')
 logger.debug(f'Logger loaded in {__name__}')
 
-# Loading database
-database= context.loadDatabase()
-
 
 
 # Functions
@@ -87,11 +100,41 @@ def addUserInDb(userEmail:str):
     Args:
         userEmail (str): user email
     """
-    database.addUser(
+    resources.database.addUser(
         userEmail=userEmail,
     )
 
 
+def setUserPassword(userEmail:str, password:str):
+    """Sets the password of a user for the Web API authentication.
+
+    Args:
+        userEmail (str): user email
+        password (str): user password
+
+    Raises:
+        UserWarning: Empty password or user not in database
+    """
+    if not password:
+        raise UserWarning('Empty password refused')
+    if not resources.database.isInDatabase(userEmail=userEmail):
+        raise UserWarning(f'User {userEmail} not in database')
+
+    ## Imported on use: the cryptography backend is long to import
+    from lib.LibTACrypto import hashPassword
+
+    resources.database.changePassword(
+        userEmail=userEmail,
+        password=hashPassword(
+            password,
+            n=int(context.AUTH['scrypt_n']),
+            r=int(context.AUTH['scrypt_r']),
+            p=int(context.AUTH['scrypt_p']),
+        ),
+    )
+    logger.debug(f'Password of {userEmail} changed')
+
+
 def delUserInDb(userEmail:str):
     """Removes a user in the database.
     If token are defined, also deletes all existing tokens.
@@ -99,33 +142,300 @@ def delUserInDb(userEmail:str):
     Args:
         userEmail (str): user email
     """
-    tokens = database.getAllTokensUser(userEmail=userEmail)
-
+    tokens = resources.database.countTokensUser(userEmail=userEmail)
     if tokens:
-        logger.warning(f'While deleting user {user}:\n')
-    for (token, sender) in tokens:
-        logger.warning(f'\tRemoving {token} requested by {sender}')
-        database.deleteToken(
-            userEmail=userEmail,
-            token=token,
-        )
+        logger.warning(f'While deleting user {userEmail}: '
+            f'removing {tokens} tokens')
 
-    database.delUser(
+    resources.database.delUser(
         userEmail=userEmail,
     )
     logger.debug(f'User {userEmail} removed from database')
 
 
-def listUsersInDb():
-    """Lists all users of the database.
+def readUsersFile(filename:str, stats:dict=None):
+    """Reads the users email addresses of a file, line by line: LDIF (mail
+    attributes of the entries, .ldif extension or first line starting with
+    "dn:"), else CSV (the mail or email column if there is a header,
+    otherwise the first field holding an address).
+
+    Args:
+        filename (str): users file
+        stats (dict, optional): receives the number of CSV lines without
+            address (skipped) under "skipped". Defaults to None.
+
+    Yields:
+        str: user email address
+    """
+    with open(filename, encoding='utf-8', errors='replace', newline='') as file:
+        firstLine = file.readline()
+        file.seek(0)
+        if filename.lower().endswith('.ldif') \
+            or firstLine.lower().startswith(('dn:', 'version:')):
+            yield from _readLdif(file)
+            return
+
+        rows = csv.reader(file)
+        header = next(rows, [])
+        names = [ name.strip().lower() for name in header ]
+        column = next(( names.index(name) for name in ('mail', 'email')
+            if name in names ), None)
+        if column is None:
+            rows = chain([header], rows)
+        for row in rows:
+            fields = row[column:column+1] if column is not None else row
+            address = next(( field.strip() for field in fields
+                if '@' in field ), None)
+            if address:
+                yield address
+            elif stats is not None and any(field.strip() for field in row):
+                stats['skipped'] = stats.get('skipped', 0) + 1
+
+
+def _readLdif(file):
+    """Yields the mail attributes of LDIF entries (folded lines and base64
+    values supported).
+    """
+    def attribute(line:str):
+        name, _, value = line.partition(':')
+        if name.strip().lower() != 'mail':
+            return None
+        if value.startswith(':'):
+            return base64.b64decode(value[1:].strip()).decode()
+        return value.strip()
+
+    current = ''
+    for line in file:
+        line = line.rstrip('\r\n')
+        if line.startswith(' '):
+            current += line[1:]
+            continue
+        if current and (address := attribute(current)):
+            yield address
+        current = line
+    if current and (address := attribute(current)):
+        yield address
+
+
+def _chunked(iterable, size:int):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _progress(action:str, done:int, end:bool=False):
+    # Progress line rewritten in place: only on a terminal
+    if sys.stderr.isatty():
+        print(f'\r{done} users {action}', end='\n' if end else '',
+            file=sys.stderr, flush=True)
+
+
+def _skipped(filename:str, stats:dict):
+    if stats.get('skipped'):
+        logger.warning(f'{stats["skipped"]} lines of {filename} without '
+            'address skipped')
+        print(f'Warning: {stats["skipped"]} lines without address skipped',
+            file=sys.stderr)
+
+
+def addUsersFromFile(filename:str, chunkSize:int=1000) -> int:
+    """Adds the users of a CSV or LDIF file (see readUsersFile), streamed
+    from disk and inserted by chunks, one transaction per chunk (users
+    already in database are ignored).
+
+    Args:
+        filename (str): users file
+        chunkSize (int, optional): users per transaction. Defaults to 1000.
+
+    Returns:
+        int: number of users read
+    """
+    done, stats = 0, {}
+    for chunk in _chunked(readUsersFile(filename, stats), chunkSize):
+        resources.database.addUsers(userEmails=chunk)
+        done += len(chunk)
+        _progress('added', done)
+    _progress('added', done, end=True)
+    _skipped(filename, stats)
+    logger.info(f'{done} users of {filename} added')
+    return done
+
+
+def delUsersFromFile(filename:str, chunkSize:int=1000) -> int:
+    """Removes the users of a CSV or LDIF file (see readUsersFile) with their
+    tokens, passwords and contacts, by set-based deletes, one transaction per
+    chunk.
+
+    Args:
+        filename (str): users file
+        chunkSize (int, optional): users per transaction. Defaults to 1000.
+
+    Returns:
+        int: number of users read
+    """
+    done, stats = 0, {}
+    for chunk in _chunked(readUsersFile(filename, stats), chunkSize):
+        resources.database.delUsers(userEmails=chunk)
+        done += len(chunk)
+        _progress('removed', done)
+    _progress('removed', done, end=True)
+    _skipped(filename, stats)
+    logger.info(f'{done} users of {filename} removed')
+    return done
+
+
+def listUsersInDb(batchSize:int=1000):
+    """Iterates over all users of the database, streamed by batches.
+
+    Args:
+        batchSize (int, optional): users fetched at once. Defaults to 1000.
+    """
+    return resources.database.iterUsers(batch_size=batchSize)
+
+
+def purgeTokensInDb(userEmails:list):
+    """Removes all the tokens of users (their addresses with extension stop
+    being accepted), keeping the users.
+
+    Args:
+        userEmails (list): users email addresses
+    """
+    resources.database.purgeTokensUsers(userEmails=userEmails)
+    logger.info(f'Tokens of {len(userEmails)} users purged')
+
+
+def purgeTokensFromFile(filename:str, chunkSize:int=1000) -> int:
+    """Removes all the tokens of the users of a CSV or LDIF file (see
+    readUsersFile), streamed from disk, one transaction per chunk.
+
+    Args:
+        filename (str): users file
+        chunkSize (int, optional): users per transaction. Defaults to 1000.
+
+    Returns:
+        int: number of users read
+    """
+    done, stats = 0, {}
+    for chunk in _chunked(readUsersFile(filename, stats), chunkSize):
+        resources.database.purgeTokensUsers(userEmails=chunk)
+        done += len(chunk)
+        _progress('purged', done)
+    _progress('purged', done, end=True)
+    _skipped(filename, stats)
+    logger.info(f'Tokens of {done} users of {filename} purged')
+    return done
+
+
+def statsOfDb(top:int=10) -> dict:
+    """Returns the database statistics: rows and sizes of the tables,
+    outstanding tokens per user and indexes usage.
+
+    Args:
+        top (int, optional): number of users with the most tokens.
+            Defaults to 10.
+
+    Returns:
+        dict: see LibTADatabase._SQLDB.getStats
+    """
+    return resources.maintenance.report(top=top)
+
+
+def maintainDb(analyze:bool=True, vacuum:bool=True, full:bool=False,
+    maxDuration:float=None) -> dict:
+    """Runs the database maintenance (ANALYZE, then SQLite VACUUM or MySQL
+    OPTIMIZE TABLE), throttled as configured in the MAINTENANCE section.
+
+    Args:
+        analyze (bool, optional): update planner statistics. Defaults to True.
+        vacuum (bool, optional): reclaim free space. Defaults to True.
+        full (bool, optional): rebuild the whole database (SQLite full
+            VACUUM, switching to incremental auto_vacuum). Defaults to False.
+        maxDuration (float, optional): time budget in seconds. Defaults to
+            the configured max_duration.
+
+    Returns:
+        dict: {"steps", "duration", "completed"}
+    """
+    maintenance = resources.maintenance
+    if maxDuration is not None:
+        maintenance.maxDuration = maxDuration
+    return maintenance.run(analyze=analyze, vacuum=vacuum, full=full)
+
+
+def slowestTracesInFile(top:int=10, filename:str=None) -> list:
+    """Returns the slowest traces recorded by the servers (see the TRACING
+    section).
+
+    Args:
+        top (int, optional): number of traces. Defaults to 10.
+        filename (str, optional): spans file. Defaults to the configured one.
+
+    Returns:
+        list: see LibTATracing.slowestTraces
+    """
+    return slowestTraces(filename or context.TRACING['file'], top=top)
+
+
+def importContactsInDb(userEmail:str, filename:str):
+    """Imports an address book (vCard, CSV or text file) in the contact list
+    of a user.
+
+    Args:
+        userEmail (str): user email
+        filename (str): address book file
     """
-    return database.getUsers()
+    with open(filename, encoding='utf-8', errors='replace') as file:
+        contacts = parseAddressBook(file)
+    resources.database.addContacts(userEmail=userEmail, senders=contacts)
+    print(f'{len(contacts)} contacts imported for {userEmail}.')
+
+
+def addPolicyRuleInDb(rule:str):
+    """Adds a policy rule "<allow|deny> <sender|domain|ip>:<pattern>" to the
+    database (the servers reload it within their reload_interval).
+
+    Args:
+        rule (str): rule line
+    """
+    rule = Rule.parse(rule)
+    resources.database.addPolicyRule(
+        action=rule.action,
+        kind=rule.kind,
+        pattern=rule.pattern,
+    )
+
+
+def delPolicyRuleInDb(ruleId:int):
+    """Removes a policy rule from the database.
+
+    Args:
+        ruleId (int): rule id (see listPolicyRulesInDb)
+    """
+    resources.database.deletePolicyRule(ruleId=ruleId)
+
+
+def listPolicyRulesInDb():
+    """Lists the policy rules of the database.
+    """
+    return [ f'{ruleId}: {action} {kind}:{pattern}'
+        for ruleId, action, kind, pattern in resources.database.getPolicyRules() ]
+
+
+def _confirm(question:str, yes:bool=False) -> bool:
+    """Asks a yes/no question on a terminal. Without terminal, the answer is
+    the yes flag.
+    """
+    if yes:
+        return True
+    if not sys.stdin.isatty():
+        return False
+    return input(f'{question} (yes/no) ').strip().lower() == 'yes'
 
 
 def newSelfSignedCert(
     contextStr:str,
     public_exponent:int=65537, key_size:int=2048,
-    days:int=365):
+    days:int=365, overwrite:bool=False):
     """Generates a self-signed certificate for a context.
     The context must have a host, a ssl_keyfile and a ssl_certfile.
 
@@ -134,7 +444,17 @@ def newSelfSignedCert(
         public_exponent (int): RSA exponent. Defaults to 65537.
         key_size (int): RSA key size. Defaults to 2048.
         days (int): validity in days from now. Defaults to 365.
+        overwrite (bool): replace existing files without asking (else asked
+            on a terminal, refused otherwise). Defaults to False.
+
+    Raises:
+        UserWarning: existing files not overwritten
     """
+    ## Imported on use: the x509 toolkit is long to import
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography import x509
+    from cryptography.x509.oid import NameOID
+    from cryptography.hazmat.primitives import hashes, serialization
 
     logger.debug('Collecting context')
     certContext = context.__getattribute__(contextStr)
@@ -177,12 +497,13 @@ def newSelfSignedCert(
     print(f'{str(cert)} generated.')
     if exists(certContext['ssl_keyfile']) \
     or exists(certContext['ssl_certfile']):
-        if input('{ssl_keyfile} or {ssl_certfile} already exists, '
-            'overwrite it? (yes/no)'.format(
+        if not _confirm('{ssl_keyfile} or {ssl_certfile} already exists, '
+            'overwrite it?'.format(
                 ssl_keyfile=certContext['ssl_keyfile'],
                 ssl_certfile=certContext['ssl_certfile'],
-            )
-        )!='yes':
+            ),
+            yes=overwrite,
+        ):
             raise UserWarning('No certificate changes done')
 
     logger.debug('Exporting private key')
@@ -206,16 +527,257 @@ def newSelfSignedCert(
 
 
 
-# Gentle intro when loading this lib...
+def _users(arguments) -> str:
+    """Describes the users given on the command line and in --file (the
+    file is streamed later, its users are not counted).
+    """
+    users = []
+    if arguments.addresses:
+        users.append(f'{len(arguments.addresses)} users')
+    if arguments.file:
+        users.append(f'the users of {arguments.file}')
+    if not users:
+        raise UserWarning('No user given')
+    return ' and '.join(users)
+
+
+def _usersCommand(arguments) -> int:
+    if arguments.action == 'list':
+        sys.stdout.writelines(f'{user}\n'
+            for user in listUsersInDb(batchSize=arguments.batch_size))
+
+    elif arguments.action == 'password':
+        password = arguments.password
+        if password is not None:
+            print('Warning: --password is visible in the process list, '
+                'prefer stdin', file=sys.stderr)
+        else:
+            password = getpass() if sys.stdin.isatty() \
+                else sys.stdin.readline().rstrip('\n')
+        setUserPassword(arguments.user, password)
+
+    elif arguments.action == 'add':
+        if not arguments.addresses and not arguments.file:
+            raise UserWarning('No user given')
+        if arguments.file:
+            addUsersFromFile(arguments.file, chunkSize=arguments.chunk_size)
+        if arguments.addresses:
+            resources.database.addUsers(userEmails=arguments.addresses)
+
+    elif arguments.action == 'del':
+        if not _confirm(f'Remove {_users(arguments)} with their tokens?',
+            yes=arguments.yes):
+            raise UserWarning('No user removed (confirm with --yes)')
+        if arguments.file:
+            delUsersFromFile(arguments.file, chunkSize=arguments.chunk_size)
+        for chunk in _chunked(arguments.addresses, arguments.chunk_size):
+            resources.database.delUsers(userEmails=chunk)
+        if arguments.addresses:
+            logger.info(f'{len(arguments.addresses)} users removed')
+    return 0
+
+
+def _tokensCommand(arguments) -> int:
+    if not _confirm(f'Purge the tokens of {_users(arguments)}?',
+        yes=arguments.yes):
+        raise UserWarning('No token purged (confirm with --yes)')
+    if arguments.file:
+        purgeTokensFromFile(arguments.file, chunkSize=arguments.chunk_size)
+    if arguments.addresses:
+        purgeTokensInDb(arguments.addresses)
+    return 0
+
+
+def _certsCommand(arguments) -> int:
+    newSelfSignedCert(
+        arguments.context,
+        key_size=arguments.key_size,
+        days=arguments.days,
+        overwrite=arguments.yes,
+    )
+    return 0
+
+
+def _statsCommand(arguments) -> int:
+    print(json.dumps(statsOfDb(top=arguments.top), indent=2))
+    return 0
+
+
+def _maintainCommand(arguments) -> int:
+    result = maintainDb(
+        analyze=not arguments.no_analyze,
+        vacuum=not arguments.no_vacuum,
+        full=arguments.full,
+        maxDuration=arguments.max_duration,
+    )
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+def _tracesCommand(arguments) -> int:
+    traces = slowestTracesInFile(top=arguments.top, filename=arguments.file)
+    if arguments.json:
+        print(json.dumps(traces, indent=2))
+    else:
+        print('\n\n'.join(formatTrace(trace) for trace in traces))
+    return 0
+
+
+def _contactsCommand(arguments) -> int:
+    importContactsInDb(arguments.user, arguments.file)
+    return 0
+
+
+def _rulesCommand(arguments) -> int:
+    if arguments.action == 'list':
+        for rule in listPolicyRulesInDb():
+            print(rule)
+    elif arguments.action == 'add':
+        addPolicyRuleInDb(arguments.rule)
+    elif arguments.action == 'del':
+        if not _confirm(f'Remove the policy rule {arguments.rule}?',
+            yes=arguments.yes):
+            raise UserWarning('No rule removed (confirm with --yes)')
+        delPolicyRuleInDb(int(arguments.rule))
+    return 0
+
+
+def argumentParser() -> argparse.ArgumentParser:
+    """Builds the command line parser of the admin tool.
+
+    Returns:
+        argparse.ArgumentParser: parser (the handler is in "command")
+    """
+    parser = argparse.ArgumentParser(
+        prog='LibTAAdmin.py',
+        description='Token Access administration tool',
+    )
+    parser.add_argument('-y', '--yes', action='store_true',
+        help='confirm the destructive actions (required without terminal)')
+    commands = parser.add_subparsers(dest='name', required=True)
+
+    users = commands.add_parser('users', help='manage users')
+    users.set_defaults(command=_usersCommand)
+    usersActions = users.add_subparsers(dest='action', required=True)
+    usersActions.add_parser('list', help='list users').add_argument(
+        '--batch-size', type=int, default=1000,
+        help='users fetched at once (default: 1000)')
+    for action, description in (('add', 'add users'),
+        ('del', 'remove users with their tokens, passwords & contacts')):
+        command = usersActions.add_parser(action, help=description)
+        command.add_argument('addresses', nargs='*', help='users addresses')
+        command.add_argument('-f', '--file',
+            help='CSV or LDIF file of users addresses')
+        command.add_argument('--chunk-size', type=int, default=1000,
+            help='users per transaction (default: 1000)')
+    password = usersActions.add_parser('password',
+        help='set the Web API password of a user (read on stdin if not given)')
+    password.add_argument('user', help='user address')
+    password.add_argument('--password',
+        help='new password (visible in the process list: prefer stdin)')
+
+    tokens = commands.add_parser('tokens', help='manage tokens')
+    tokens.set_defaults(command=_tokensCommand)
+    tokensActions = tokens.add_subparsers(dest='action', required=True)
+    purge = tokensActions.add_parser('purge', help='remove all tokens of users')
+    purge.add_argument('addresses', nargs='*', help='users addresses')
+    purge.add_argument('-f', '--file', help='CSV or LDIF file of users addresses')
+    purge.add_argument('--chunk-size', type=int, default=1000,
+        help='users per transaction (default: 1000)')
+
+    certs = commands.add_parser('certs',
+        help='generate a self-signed certificate')
+    certs.set_defaults(command=_certsCommand)
+    certs.add_argument('context', choices=('WEB_API', 'SMTP_SERVER'))
+    certs.add_argument('--days', type=int, default=365,
+        help='validity in days (default: 365)')
+    certs.add_argument('--key-size', type=int, default=2048,
+        help='RSA key size (default: 2048)')
+
+    stats = commands.add_parser('stats', help='show database statistics')
+    stats.set_defaults(command=_statsCommand)
+    stats.add_argument('--top', type=int, default=10,
+        help='users with the most tokens shown (default: 10)')
+
+    maintain = commands.add_parser('maintain',
+        help='update planner statistics & reclaim free space (throttled)')
+    maintain.set_defaults(command=_maintainCommand)
+    maintain.add_argument('--no-analyze', action='store_true',
+        help='skip the planner statistics')
+    maintain.add_argument('--no-vacuum', action='store_true',
+        help='skip the free space reclaiming')
+    maintain.add_argument('--full', action='store_true',
+        help='rebuild the whole database (SQLite: blocks the writers)')
+    maintain.add_argument('--max-duration', type=float,
+        help='time budget in seconds (default: configured max_duration)')
+
+    traces = commands.add_parser('traces',
+        help='report the slowest traces recorded by the servers')
+    traces.set_defaults(command=_tracesCommand)
+    traces.add_argument('--top', type=int, default=10,
+        help='number of traces (default: 10)')
+    traces.add_argument('-f', '--file',
+        help='spans file (default: configured TRACING file)')
+    traces.add_argument('--json', action='store_true',
+        help='print the traces as JSON')
+
+    contacts = commands.add_parser('contacts',
+        help='import an address book in the contact list of a user')
+    contacts.set_defaults(command=_contactsCommand)
+    contacts.add_argument('user', help='user address')
+    contacts.add_argument('file', help='vCard, CSV or text address book')
+
+    rules = commands.add_parser('rules', help='manage database policy rules')
+    rules.set_defaults(command=_rulesCommand)
+    rulesActions = rules.add_subparsers(dest='action', required=True)
+    rulesActions.add_parser('list', help='list rules')
+    rulesActions.add_parser('add', help='add a rule').add_argument('rule',
+        help='"<allow|deny> <sender|domain|ip>:<pattern>"')
+    rulesActions.add_parser('del', help='remove a rule').add_argument('rule',
+        help='rule id')
+    return parser
+
+
+def main(argv:list=None) -> int:
+    """Runs an admin command line.
+
+    Args:
+        argv (list, optional): arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: exit code
+    """
+    arguments = argumentParser().parse_args(argv)
+    try:
+        return arguments.command(arguments)
+    except (UserWarning, ValueError, SyntaxError, OSError) as error:
+        logger.error(f'{arguments.name}: {error}')
+        print(f'Error: {error}', file=sys.stderr)
+        return 1
+    finally:
+        if resources.isLoaded('database'):
+            resources.close()
+
+
 
-print("""\
+# Gentle intro when loading this lib in an interactive session...
+
+if __name__ != "__main__" and (hasattr(sys, 'ps1') or sys.flags.interactive):
+    print("""\
 Hello admin!\n\n{intro}\nIt includes:
  - {funcs}""".format(
-    intro=__doc__,
-    funcs="\n - ".join([ method + str(signature(globals()[method])) + ':\n\t' + str(globals()[method].__doc__).splitlines()[0]
-        for method in globals()
-            if not method.startswith('_') 
-            and callable(globals()[method])
-            and globals()[method].__module__ == __name__]),
-)
-)
+        intro=__doc__,
+        funcs="\n - ".join([ method + str(signature(globals()[method])) + ':\n\t' + str(globals()[method].__doc__).splitlines()[0]
+            for method in globals()
+                if not method.startswith('_')
+                and callable(globals()[method])
+                and globals()[method].__module__ == __name__]),
+    )
+    )
+
+
+
+# Launcher
+
+if __name__=="__main__":
+    sys.exit(main())
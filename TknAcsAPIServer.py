@@ -15,12 +15,15 @@ __status__='Development'
 
 # Built-in
 from os import environ
-from os.path import dirname, abspath
-import logging.config
+from os.path import dirname, abspath, exists
+from importlib.util import find_spec
+import logging.config, socket
 
 
 # Other libs
 import uvicorn
+from uvicorn.config import LOGGING_CONFIG
+from uvicorn.supervisors import Multiprocess
 
 
 # Owned libs
@@ -33,8 +36,9 @@ from lib.LibTAServer import *
 environ['TKNACS_PATH'] = dirname(abspath(__file__))
 context.loadConfig(CONFIG_FILE)
 
-## Creating specially-configured logger
-logging.config.dictConfig({
+## Creating specially-configured logger (also applied by uvicorn in the
+## spawned worker processes, with its own loggers)
+LOG_CONFIG = {
     'version': 1,
     'disable_existing_loggers':False,
     'formatters':{
@@ -42,12 +46,19 @@ logging.config.dictConfig({
             'format':'%(levelname)s:  %(asctime)s  [%(process)d][%(filename)s][%(funcName)s]  %(message)s',
         },
     },
+    'filters':{
+        'sampling':{
+            '()':'lib.LibTALogging.SamplingFilter',
+            'rate':context.GLOBAL['log_sampling'],
+        },
+    },
     'handlers':{
         "file_handler":{
-            'class':'logging.FileHandler',
+            'class':'lib.LibTALogging.QueueFileHandler',
             'filename':context.GLOBAL['logging'],
             'encoding':'utf-8',
             'formatter':'default_formatter',
+            'filters':['sampling'],
         },
     },
     'loggers':{
@@ -57,20 +68,93 @@ logging.config.dictConfig({
             'propagate':True
         }
     }
-})
+}
+logging.config.dictConfig(LOG_CONFIG)
 logger = logging.getLogger('tknAcsServers')
 logger.debug(f'Logger loaded in {__name__}')
 
 
-# Launcher
+# Functions
 
-if __name__=="__main__":
-    logger.debug('Launching API server')
-    uvicorn.run(
+def launchApiServer(
+    host:str,
+    port:str,
+    ssl_keyfile:str=None,
+    ssl_certfile:str=None,
+    mode:str='development',
+    workers:int=1,
+    keep_alive:int=5,
+    backlog:int=2048,
+    **kwargs):
+    """Launches the uvicorn server of the API.
+    In development mode, a single process is reloaded on code changes.
+    In production mode, several worker processes are started (each one opening
+    its own database connection), with uvloop & httptools when installed.
+    HTTPS is used if the SSL certificate exists.
+
+    Args:
+        host (str): listening host
+        port (str): listening port
+        ssl_keyfile (str, optional): SSL private key. Defaults to None.
+        ssl_certfile (str, optional): SSL certificate. Defaults to None.
+        mode (str, optional): development or production.
+            Defaults to 'development'.
+        workers (int, optional): number of workers in production.
+            Defaults to 1.
+        keep_alive (int, optional): idle connections timeout in production.
+            Defaults to 5.
+        backlog (int, optional): listen backlog in production.
+            Defaults to 2048.
+    """
+    serverKwargs = {
+        'host': host,
+        'port': int(port),
+    }
+    # The workers are spawned: they configure the logging from log_config
+    logConfig = {
+        **LOGGING_CONFIG,
+        **{ section: {**LOGGING_CONFIG.get(section, {}), **LOG_CONFIG[section]}
+            for section in ('formatters', 'filters', 'handlers', 'loggers') },
+    }
+    if ssl_certfile and exists(ssl_certfile):
+        serverKwargs.update({
+            'ssl_keyfile': ssl_keyfile,
+            'ssl_certfile': ssl_certfile,
+        })
+
+    if mode != 'production':
+        logger.debug(f'Launching API server ({mode}): {serverKwargs}')
+        uvicorn.run("lib.LibTAWebAPI:app", reload=True, log_config=logConfig,
+            **serverKwargs)
+        return
+
+    config = uvicorn.Config(
         "lib.LibTAWebAPI:app",
-        host=context.WEB_API['host'],
-        port=int(context.WEB_API['port']),
-        reload=True,
-        ssl_keyfile=context.WEB_API["ssl_keyfile"],
-        ssl_certfile=context.WEB_API["ssl_certfile"],
+        workers=int(workers),
+        loop='uvloop' if find_spec('uvloop') else 'asyncio',
+        http='httptools' if find_spec('httptools') else 'h11',
+        timeout_keep_alive=int(keep_alive),
+        backlog=int(backlog),
+        access_log=False,
+        log_config=logConfig,
+        **serverKwargs
     )
+    logger.debug(f'Launching API server ({mode}): {serverKwargs}, '
+        f'{config.workers} workers, {config.loop} loop, {config.http} http')
+
+    if config.workers > 1:
+        # The listening socket shared by the workers is created without TCP
+        # protocol number, asyncio then doesn't set TCP_NODELAY on accepted
+        # connections: it is set on the listening one to be inherited.
+        sock = config.bind_socket()
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        Multiprocess(config, sockets=[sock]).run()
+    else:
+        uvicorn.Server(config).run()
+
+
+
+# Launcher
+
+if __name__=="__main__":
+    launchApiServer(**context.WEB_API)
@@ -39,12 +39,19 @@ logging.config.dictConfig({
             'format':'%(levelname)s:  %(asctime)s  [%(process)d][%(filename)s][%(funcName)s]  %(message)s',
         },
     },
+    'filters':{
+        'sampling':{
+            '()':'lib.LibTALogging.SamplingFilter',
+            'rate':context.GLOBAL['log_sampling'],
+        },
+    },
     'handlers':{
         "file_handler":{
-            'class':'logging.FileHandler',
+            'class':'lib.LibTALogging.QueueFileHandler',
             'filename':context.GLOBAL['logging'],
             'encoding':'utf-8',
             'formatter':'default_formatter',
+            'filters':['sampling'],
         },
     },
     'loggers':{
@@ -64,10 +71,6 @@ logger = logging.getLogger('tknAcsServers')
 logger.debug(f'Logger loaded in {__name__}')
 
 
-## Load database
-database=context.loadDatabase()
-
-
 
 # Launcher
 